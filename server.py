@@ -20,10 +20,11 @@ Shell & Git:
 
 Web & API:
 13. fetch_url - Fetch webpage content as text
-14. http_request - Make HTTP API calls (GET/POST/PUT/DELETE)
+14. fetch_urls - Fetch several webpages concurrently
+15. http_request - Make HTTP API calls (GET/POST/PUT/DELETE)
 
 System:
-15. get_time - Get current local date and time
+16. get_time - Get current local date and time
 
 Usage:
     python server.py
@@ -32,16 +33,53 @@ Configure in Claude Desktop's claude_desktop_config.json
 """
 
 import os
+import sys
 import asyncio
 import shutil
-import fnmatch
+import stat as _stat
 import json
 import re
+import fnmatch
+import shlex
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 from datetime import datetime
+from html import unescape
 
 import httpx
 
+# orjson is optional; fall back to the stdlib json module when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# lxml is optional; strip_html falls back to regexes when it isn't installed
+try:
+    from lxml import etree as lxml_etree
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_etree = None
+    lxml_html = None
+
+# uvloop is optional and not available on Windows; the stock asyncio loop is used without it.
+# uvloop.run() needs uvloop 0.18+, so older versions are ignored too.
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+if uvloop is not None and not hasattr(uvloop, "run"):
+    uvloop = None
+
+# HTTP/2 needs the h2 package (pip install httpx[http2]); use HTTP/1.1 without it
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
@@ -55,848 +93,1390 @@ ALLOWED_PATHS = [
     Path("C:/Users/YOUR_USERNAME/Documents"),
 ]
 
+# Read at most this many bytes of a fetch_url response body
+MAX_FETCH_BYTES = 100_000
+
+# Read at most this many bytes of an http_request response body (override with HERMES_MAX_BODY_BYTES)
+try:
+    MAX_BODY_BYTES = int(os.environ.get("HERMES_MAX_BODY_BYTES", ""))
+except ValueError:
+    MAX_BODY_BYTES = 0
+if MAX_BODY_BYTES <= 0:
+    # Unset, non-numeric or not positive: use the default
+    MAX_BODY_BYTES = 262_144
+
+# Default max_chars for fetch_url, fetch_urls and http_request output
+MAX_RESPONSE_CHARS = 50_000
+
+# Fetch at most this many fetch_urls pages at once
+MAX_CONCURRENT_FETCHES = 10
+
+# Keep at most this many bytes of subprocess stdout/stderr each
+MAX_OUTPUT_BYTES = 1_000_000
+
+# Stop collecting search_files matches after this many results
+MAX_SEARCH_RESULTS = 10000
+
+# Cache up to this many http_request GET responses, each for at most this many seconds
+RESPONSE_CACHE_SIZE = 128
+RESPONSE_CACHE_TTL = 600.0
+
+# Remember failed http_request GETs briefly so retry loops don't hammer the server
+ERROR_CACHE_SIZE = 256
+CLIENT_ERROR_TTL = 60.0
+SERVER_ERROR_TTL = 10.0
+CONNECT_ERROR_TTL = 30.0
+READ_ERROR_TTL = 5.0
+
+# Human-readable part of the get_time output
+GET_TIME_FORMAT = '%A, %d %B %Y, %I:%M %p'
+
+# Git executable, located once at import
+GIT_EXE = next(
+    (exe for exe in (
+        r"C:\Program Files\Git\cmd\git.exe",
+        r"C:\Program Files\Git\bin\git.exe",
+    ) if Path(exe).exists()),
+    None
+)
+
+def _path_key(path: str | Path) -> str:
+    """Normalize a resolved path into a case-folded, separator-terminated prefix."""
+    return os.path.normcase(str(path)).rstrip(os.sep) + os.sep
+
+# Resolved once at import so each check only resolves the requested path
+_ALLOWED_ROOTS = tuple(_path_key(p.resolve()) for p in ALLOWED_PATHS)
+
 def is_path_allowed(path: Path) -> bool:
     """Check if path is within allowed directories."""
-    path = path.resolve()
-    return any(
-        path == allowed or allowed in path.parents
-        for allowed in ALLOWED_PATHS
+    # Always resolve: a purely lexical check would let symlinks/junctions inside
+    # an allowed root point outside it. realpath skips building a Path to str() again.
+    try:
+        key = _path_key(os.path.realpath(path))
+    except (OSError, ValueError):
+        return False
+    return any(key.startswith(root) for root in _ALLOWED_ROOTS)
+
+# HTML stripping patterns, compiled once at import
+_SCRIPT_RE = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+_STYLE_RE = re.compile(r'<style[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# Shared HTTP client so connections are pooled across tool calls
+_http_client: httpx.AsyncClient | None = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        # No explicit transport: it would stop httpx from honoring HTTP(S)_PROXY/ALL_PROXY
+        _http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=30.0
+            ),
+            follow_redirects=True,
+            timeout=30.0
+        )
+    return _http_client
+
+async def close_http_client():
+    """Close the shared HTTP client if it was created."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+class TTLCache:
+    """Small LRU cache whose entries each expire after their own TTL."""
+    
+    # Entries are stored as plain (expires_at, value) tuples
+    __slots__ = ("maxsize", "_data")
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+    
+    def get(self, key):
+        """Return the value cached under key, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+    
+    def set(self, key, value, ttl: float):
+        """Cache value under key for ttl seconds, evicting the least recently used entry when full."""
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def discard(self, predicate):
+        """Remove every entry whose key satisfies predicate."""
+        for key in [key for key in self._data if predicate(key)]:
+            del self._data[key]
+
+# Successful http_request GET responses, keyed by (url, headers, max_chars)
+_response_cache = TTLCache(RESPONSE_CACHE_SIZE)
+
+# 4xx/5xx http_request GET responses, same keys as _response_cache
+_error_cache = TTLCache(ERROR_CACHE_SIZE)
+
+# http_request GETs currently being fetched, same keys as _response_cache
+_inflight: dict[tuple, asyncio.Task] = {}
+
+# URLs with a write (non-GET/HEAD) http_request in progress, and how many
+_pending_writes: dict[str, int] = {}
+
+def invalidate_url(url: str):
+    """Forget cached and in-flight GETs of url, after a request that may have changed it."""
+    _response_cache.discard(lambda key: key[0] == url)
+    _error_cache.discard(lambda key: key[0] == url)
+    for key in [key for key in _inflight if key[0] == url]:
+        # The orphaned fetch still answers its callers but no longer caches its result
+        del _inflight[key]
+
+def bypasses_cache(headers: dict) -> bool:
+    """Whether the caller's Cache-Control request header asks for a fresh response."""
+    for name, value in (headers or {}).items():
+        if str(name).lower() == "cache-control":
+            value = str(value).lower()
+            return "no-cache" in value or "no-store" in value
+    return False
+
+def _owns_inflight(cache_key) -> bool:
+    """Whether the running task is still the registered fetch for cache_key."""
+    return cache_key is not None and _inflight.get(cache_key) is asyncio.current_task()
+
+def _forget_inflight(cache_key, task: asyncio.Task):
+    """Unregister task once it finishes, unless a newer fetch has taken its place."""
+    if _inflight.get(cache_key) is task:
+        del _inflight[cache_key]
+
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+def response_cache_ttl(headers: httpx.Headers) -> float | None:
+    """Return how long a GET response may be cached, or None if it must not be."""
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control or "no-cache" in cache_control or "private" in cache_control:
+        return None
+    match = _MAX_AGE_RE.search(cache_control)
+    if match:
+        max_age = int(match.group(1))
+        return min(max_age, RESPONSE_CACHE_TTL) if max_age > 0 else None
+    return RESPONSE_CACHE_TTL
+
+# Media types whose bodies are described by size instead of being downloaded and decoded
+_BINARY_TYPES = ("image/", "audio/", "video/", "application/octet-stream", "application/pdf")
+
+def describe_binary(response: httpx.Response) -> str | None:
+    """Return a placeholder for a binary response body, or None if the body is text."""
+    content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+    if not content_type.startswith(_BINARY_TYPES):
+        return None
+    size = response.headers.get("content-length")
+    return f"<{size} bytes of {content_type}>" if size else f"<binary {content_type} content>"
+
+async def read_capped_body(response: httpx.Response, cap: int) -> tuple[bytes, bool]:
+    """Read a streamed response body up to cap bytes. Returns (body, truncated)."""
+    chunks: list[bytes] = []
+    total = 0
+    async for chunk in response.aiter_bytes(65536):
+        chunks.append(chunk)
+        total += len(chunk)
+        if total >= cap:
+            return b"".join(chunks)[:cap], True
+    return b"".join(chunks), False
+
+async def read_capped_stream(stream: asyncio.StreamReader, cap: int) -> tuple[bytes, bool]:
+    """Read a subprocess pipe up to cap bytes. Returns (data, truncated)."""
+    buf = bytearray()
+    while len(buf) < cap:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return bytes(buf), False
+        buf.extend(chunk)
+    return bytes(buf[:cap]), True
+
+async def communicate_capped(process: asyncio.subprocess.Process) -> tuple[bytes, bytes, bool]:
+    """Like process.communicate(), but kills the process once either pipe exceeds MAX_OUTPUT_BYTES.
+    
+    Returns (stdout, stderr, truncated).
+    """
+    async def drain(stream):
+        data, truncated = await read_capped_stream(stream, MAX_OUTPUT_BYTES)
+        if truncated and process.returncode is None:
+            # Stop a runaway process instead of letting it fill the pipe until timeout
+            process.kill()
+        return data, truncated
+    
+    (stdout, out_truncated), (stderr, err_truncated) = await asyncio.gather(
+        drain(process.stdout),
+        drain(process.stderr)
     )
+    await process.wait()
+    return stdout, stderr, out_truncated or err_truncated
+
+def split_args(args: str) -> list[str]:
+    """Split a command-line string on whitespace, honoring quotes.
+    
+    Backslashes are kept literally so Windows paths pass through unchanged.
+    """
+    lexer = shlex.shlex(args, posix=True)
+    lexer.whitespace_split = True
+    lexer.escape = ''
+    lexer.commenters = ''
+    return list(lexer)
+
+def pretty_json(data: bytes) -> str:
+    """Re-indent a JSON document. Raises ValueError if data is not valid JSON."""
+    if orjson is not None:
+        return orjson.dumps(orjson.loads(data), option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(json.loads(data), indent=2, ensure_ascii=False)
+
+def _strip_html_lxml(html: str) -> str:
+    """HTML to text conversion using lxml's C parser."""
+    doc = lxml_html.fromstring(html)
+    for bad in doc.xpath('//script | //style | //comment()'):
+        bad.drop_tree()
+    # Join text nodes with spaces so adjacent block elements don't run together
+    text = ' '.join(doc.itertext())
+    return _WS_RE.sub(' ', text).strip()
 
 def strip_html(html: str) -> str:
     """Basic HTML to text conversion."""
+    # No tags at all (JSON, plain text): skip the tag-stripping scans
+    if '<' not in html:
+        return _WS_RE.sub(' ', unescape(html)).strip()
+    if lxml_html is not None:
+        try:
+            return _strip_html_lxml(html)
+        except (ValueError, lxml_etree.LxmlError):
+            # Empty documents, encoding declarations etc.; use the regex path below
+            pass
     # Remove script and style elements
-    html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
+    html = _SCRIPT_RE.sub('', html)
+    html = _STYLE_RE.sub('', html)
     # Remove HTML tags
-    html = re.sub(r'<[^>]+>', ' ', html)
-    # Decode common HTML entities
-    html = html.replace('&nbsp;', ' ')
-    html = html.replace('&amp;', '&')
-    html = html.replace('&lt;', '<')
-    html = html.replace('&gt;', '>')
-    html = html.replace('&quot;', '"')
+    html = _TAG_RE.sub(' ', html)
+    # Decode HTML entities (named and numeric); &nbsp; becomes \xa0 and is collapsed below
+    html = unescape(html)
     # Collapse whitespace
-    html = re.sub(r'\s+', ' ', html)
+    html = _WS_RE.sub(' ', html)
     return html.strip()
 
-@server.list_tools()
-async def list_tools():
-    """List available tools."""
-    return [
-        Tool(
-            name="read_file",
-            description="Read the contents of a text file. Returns the file content as text.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Absolute path to the file to read"
-                    }
+# Cap concurrent filesystem operations so bursts of tool calls can't exhaust file handles
+# or the default thread pool
+MAX_FS_CONCURRENCY = 32
+_FS_SEM = asyncio.BoundedSemaphore(MAX_FS_CONCURRENCY)
+
+async def run_fs(func, *args):
+    """Run a blocking filesystem call in a worker thread, bounded by _FS_SEM."""
+    async with _FS_SEM:
+        return await asyncio.to_thread(func, *args)
+
+# Blocking filesystem helpers, run via run_fs so they don't stall the event loop
+# Text is read and written in binary mode and decoded/encoded in one pass, skipping newline translation
+def _read_text(path: Path) -> str:
+    """Read path as UTF-8 text."""
+    return path.read_bytes().decode('utf-8')
+
+def _write_text(path: Path, content: str) -> int:
+    """Write content to path, creating parent directories if needed. Returns bytes written."""
+    data = content.encode('utf-8')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return len(data)
+
+def _append_text(path: Path, content: str) -> int:
+    """Append content to path, creating parent directories if needed. Returns bytes written."""
+    data = content.encode('utf-8')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'ab') as f:
+        f.write(data)
+    return len(data)
+
+def _with_parent_dirs(func, source: Path, destination: Path):
+    """Run func(source, destination), creating the destination's missing parents if needed.
+    
+    Parents are only created once the source is known to exist, so a missing source
+    doesn't leave empty directories behind.
+    """
+    try:
+        func(source, destination)
+    except FileNotFoundError:
+        if destination.parent.exists() or not source.exists():
+            raise
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        func(source, destination)
+
+def _move(source: Path, destination: Path):
+    """Move source to destination, as a single rename where possible."""
+    if os.path.isdir(destination):
+        # Move into the directory; os.replace would replace an empty one instead
+        shutil.move(str(source), str(destination))
+        return
+    try:
+        # Same-volume moves are a single atomic rename
+        os.replace(source, destination)
+    except OSError:
+        # Cross-volume
+        shutil.move(str(source), str(destination))
+
+def _copy_file(source: Path, destination: Path):
+    """Copy source to destination, creating parent directories if needed."""
+    _with_parent_dirs(shutil.copy2, source, destination)
+
+def _move_file(source: Path, destination: Path):
+    """Move source to destination, creating parent directories if needed."""
+    _with_parent_dirs(_move, source, destination)
+
+def _list_directory(path: Path) -> list[str]:
+    """Return directory entries prefixed with [DIR] or [FILE]."""
+    # DirEntry.is_dir() reuses the type info from the directory scan instead of a stat per entry
+    with os.scandir(path) as it:
+        entries = sorted(it, key=lambda e: os.path.normcase(e.name))
+    return [f"{'[DIR]' if e.is_dir() else '[FILE]'} {e.name}" for e in entries]
+
+def _search_files(path: Path, pattern: str, recursive: bool) -> list[str]:
+    """Return up to MAX_SEARCH_RESULTS files under path matching pattern."""
+    if os.sep in pattern or (os.altsep and os.altsep in pattern):
+        # Patterns spanning directories need pathlib's per-component matching.
+        # pathlib follows ".." and symlinks in the pattern, so keep it relative and
+        # check every result against the allowed roots.
+        pattern_path = Path(pattern)
+        if pattern_path.is_absolute() or pattern_path.drive or '..' in pattern_path.parts:
+            return []
+        candidates = path.rglob(pattern) if recursive else path.glob(pattern)
+        matches = []
+        for item in candidates:
+            if item.is_file() and is_path_allowed(item):
+                matches.append(str(item))
+                if len(matches) >= MAX_SEARCH_RESULTS:
+                    break
+        return matches
+    
+    # Plain name patterns: translate once and match names straight from the directory scan
+    is_match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+    matches = []
+    if recursive:
+        for root, _, files in os.walk(path):
+            for name in files:
+                if is_match(os.path.normcase(name)):
+                    matches.append(os.path.join(root, name))
+                    if len(matches) >= MAX_SEARCH_RESULTS:
+                        return matches
+    else:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_file() and is_match(os.path.normcase(entry.name)):
+                    matches.append(entry.path)
+                    if len(matches) >= MAX_SEARCH_RESULTS:
+                        break
+    return matches
+
+# Tool definitions are static, so build them once at import
+_TOOLS = [
+    Tool(
+        name="read_file",
+        description="Read the contents of a text file. Returns the file content as text.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Absolute path to the file to read"
+                }
+            },
+            "required": ["path"]
+        }
+    ),
+    Tool(
+        name="write_file",
+        description="Write content to a file. Creates the file if it doesn't exist, overwrites if it does.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Absolute path to the file to write"
                 },
-                "required": ["path"]
-            }
-        ),
-        Tool(
-            name="write_file",
-            description="Write content to a file. Creates the file if it doesn't exist, overwrites if it does.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Absolute path to the file to write"
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "Content to write to the file"
-                    }
+                "content": {
+                    "type": "string",
+                    "description": "Content to write to the file"
+                }
+            },
+            "required": ["path", "content"]
+        }
+    ),
+    Tool(
+        name="append_to_file",
+        description="Append content to the end of a file. Creates the file if it doesn't exist.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Absolute path to the file"
                 },
-                "required": ["path", "content"]
-            }
-        ),
-        Tool(
-            name="append_to_file",
-            description="Append content to the end of a file. Creates the file if it doesn't exist.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Absolute path to the file"
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "Content to append"
-                    }
+                "content": {
+                    "type": "string",
+                    "description": "Content to append"
+                }
+            },
+            "required": ["path", "content"]
+        }
+    ),
+    Tool(
+        name="delete_file",
+        description="Delete a file.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Absolute path to the file to delete"
+                }
+            },
+            "required": ["path"]
+        }
+    ),
+    Tool(
+        name="copy_file",
+        description="Copy a file to a new location.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "source": {
+                    "type": "string",
+                    "description": "Absolute path to the source file"
                 },
-                "required": ["path", "content"]
-            }
-        ),
-        Tool(
-            name="delete_file",
-            description="Delete a file.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Absolute path to the file to delete"
-                    }
+                "destination": {
+                    "type": "string",
+                    "description": "Absolute path to the destination"
+                }
+            },
+            "required": ["source", "destination"]
+        }
+    ),
+    Tool(
+        name="move_file",
+        description="Move or rename a file.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "source": {
+                    "type": "string",
+                    "description": "Absolute path to the source file"
                 },
-                "required": ["path"]
-            }
-        ),
-        Tool(
-            name="copy_file",
-            description="Copy a file to a new location.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "source": {
-                        "type": "string",
-                        "description": "Absolute path to the source file"
-                    },
-                    "destination": {
-                        "type": "string",
-                        "description": "Absolute path to the destination"
-                    }
+                "destination": {
+                    "type": "string",
+                    "description": "Absolute path to the destination"
+                }
+            },
+            "required": ["source", "destination"]
+        }
+    ),
+    Tool(
+        name="file_exists",
+        description="Check if a file or directory exists.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Absolute path to check"
+                }
+            },
+            "required": ["path"]
+        }
+    ),
+    Tool(
+        name="get_file_info",
+        description="Get file metadata (size, modified time, type).",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Absolute path to the file"
+                }
+            },
+            "required": ["path"]
+        }
+    ),
+    Tool(
+        name="list_directory",
+        description="List files and folders in a directory. Returns names with [FILE] or [DIR] prefix.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Absolute path to the directory to list"
+                }
+            },
+            "required": ["path"]
+        }
+    ),
+    Tool(
+        name="search_files",
+        description="Search for files matching a pattern in a directory tree.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Absolute path to the directory to search"
                 },
-                "required": ["source", "destination"]
-            }
-        ),
-        Tool(
-            name="move_file",
-            description="Move or rename a file.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "source": {
-                        "type": "string",
-                        "description": "Absolute path to the source file"
-                    },
-                    "destination": {
-                        "type": "string",
-                        "description": "Absolute path to the destination"
-                    }
+                "pattern": {
+                    "type": "string",
+                    "description": "Glob pattern to match (e.g., '*.py', '*.md')"
                 },
-                "required": ["source", "destination"]
-            }
-        ),
-        Tool(
-            name="file_exists",
-            description="Check if a file or directory exists.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Absolute path to check"
-                    }
+                "recursive": {
+                    "type": "boolean",
+                    "description": "Search subdirectories (default: true)"
+                }
+            },
+            "required": ["path", "pattern"]
+        }
+    ),
+    Tool(
+        name="run_powershell",
+        description="Execute a PowerShell command and return the output.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "command": {
+                    "type": "string",
+                    "description": "PowerShell command to execute"
                 },
-                "required": ["path"]
-            }
-        ),
-        Tool(
-            name="get_file_info",
-            description="Get file metadata (size, modified time, type).",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Absolute path to the file"
-                    }
+                "working_directory": {
+                    "type": "string",
+                    "description": "Optional working directory for the command"
+                }
+            },
+            "required": ["command"]
+        }
+    ),
+    Tool(
+        name="run_git",
+        description="Execute a Git command and return the output.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "args": {
+                    "type": "string",
+                    "description": "Git arguments (e.g., 'status', 'log --oneline -5')"
                 },
-                "required": ["path"]
-            }
-        ),
-        Tool(
-            name="list_directory",
-            description="List files and folders in a directory. Returns names with [FILE] or [DIR] prefix.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Absolute path to the directory to list"
-                    }
+                "working_directory": {
+                    "type": "string",
+                    "description": "Repository directory"
+                }
+            },
+            "required": ["args", "working_directory"]
+        }
+    ),
+    Tool(
+        name="fetch_url",
+        description="Fetch a webpage and return its content as plain text (HTML stripped).",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "url": {
+                    "type": "string",
+                    "description": "URL to fetch"
                 },
-                "required": ["path"]
-            }
-        ),
-        Tool(
-            name="search_files",
-            description="Search for files matching a pattern in a directory tree.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Absolute path to the directory to search"
-                    },
-                    "pattern": {
-                        "type": "string",
-                        "description": "Glob pattern to match (e.g., '*.py', '*.md')"
-                    },
-                    "recursive": {
-                        "type": "boolean",
-                        "description": "Search subdirectories (default: true)"
-                    }
+                "raw": {
+                    "type": "boolean",
+                    "description": "Return raw HTML instead of stripped text (default: false)"
                 },
-                "required": ["path", "pattern"]
-            }
-        ),
-        Tool(
-            name="run_powershell",
-            description="Execute a PowerShell command and return the output.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "command": {
-                        "type": "string",
-                        "description": "PowerShell command to execute"
-                    },
-                    "working_directory": {
-                        "type": "string",
-                        "description": "Optional working directory for the command"
-                    }
+                "max_chars": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Maximum characters of content to return (default: 50000)"
+                }
+            },
+            "required": ["url"]
+        }
+    ),
+    Tool(
+        name="fetch_urls",
+        description="Fetch several webpages concurrently. Returns one result per URL, in order.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "urls": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "URLs to fetch"
                 },
-                "required": ["command"]
-            }
-        ),
-        Tool(
-            name="run_git",
-            description="Execute a Git command and return the output.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "args": {
-                        "type": "string",
-                        "description": "Git arguments (e.g., 'status', 'log --oneline -5')"
-                    },
-                    "working_directory": {
-                        "type": "string",
-                        "description": "Repository directory"
-                    }
+                "raw": {
+                    "type": "boolean",
+                    "description": "Return raw HTML instead of stripped text (default: false)"
                 },
-                "required": ["args", "working_directory"]
-            }
-        ),
-        Tool(
-            name="fetch_url",
-            description="Fetch a webpage and return its content as plain text (HTML stripped).",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "url": {
-                        "type": "string",
-                        "description": "URL to fetch"
-                    },
-                    "raw": {
-                        "type": "boolean",
-                        "description": "Return raw HTML instead of stripped text (default: false)"
-                    }
+                "max_chars": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Maximum characters of content to return (default: 50000)"
+                }
+            },
+            "required": ["urls"]
+        }
+    ),
+    Tool(
+        name="http_request",
+        description="Make an HTTP API request. Returns response body and status.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "method": {
+                    "type": "string",
+                    "description": "HTTP method (GET, POST, PUT, DELETE, PATCH)",
+                    "enum": ["GET", "POST", "PUT", "DELETE", "PATCH"]
                 },
-                "required": ["url"]
-            }
-        ),
-        Tool(
-            name="http_request",
-            description="Make an HTTP API request. Returns response body and status.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "method": {
-                        "type": "string",
-                        "description": "HTTP method (GET, POST, PUT, DELETE, PATCH)",
-                        "enum": ["GET", "POST", "PUT", "DELETE", "PATCH"]
-                    },
-                    "url": {
-                        "type": "string",
-                        "description": "URL to request"
-                    },
-                    "headers": {
-                        "type": "object",
-                        "description": "Optional headers as key-value pairs"
-                    },
-                    "body": {
-                        "type": "string",
-                        "description": "Optional request body (for POST/PUT/PATCH)"
-                    },
-                    "json_body": {
-                        "type": "object",
-                        "description": "Optional JSON body (will be serialized)"
-                    }
+                "url": {
+                    "type": "string",
+                    "description": "URL to request"
                 },
-                "required": ["method", "url"]
-            }
-        ),
-        Tool(
-            name="get_time",
-            description="Get current local date and time on the machine.",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        )
-    ]
+                "headers": {
+                    "type": "object",
+                    "description": "Optional headers as key-value pairs"
+                },
+                "body": {
+                    "type": "string",
+                    "description": "Optional request body (for POST/PUT/PATCH)"
+                },
+                "json_body": {
+                    "type": "object",
+                    "description": "Optional JSON body (will be serialized)"
+                },
+                "max_chars": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Maximum characters of response body to return (default: 50000)"
+                }
+            },
+            "required": ["method", "url"]
+        }
+    ),
+    Tool(
+        name="get_time",
+        description="Get current local date and time on the machine.",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    )
+]
 
-@server.call_tool()
-async def call_tool(name: str, arguments: dict):
-    """Handle tool calls."""
+@server.list_tools()
+async def list_tools():
+    """List available tools."""
+    return _TOOLS
+
+# Fixed-text error responses, built once and shared
+_ERR_PATH_NOT_ALLOWED = [TextContent(type="text", text="Error: Path not allowed")]
+_ERR_COMMAND_TIMEOUT = [TextContent(type="text", text="Error: Command timed out after 30 seconds")]
+_ERR_GIT_NOT_FOUND = [TextContent(type="text", text="Error: Git not found. Check installation.")]
+_ERR_GIT_TIMEOUT = [TextContent(type="text", text="Error: Git command timed out after 10 seconds")]
+_ERR_FETCH_TIMEOUT = [TextContent(type="text", text="Error: Request timed out after 15 seconds")]
+_ERR_REQUEST_TIMEOUT = [TextContent(type="text", text="Error: Request timed out after 30 seconds")]
+
+def _unknown_tool(name: str) -> list[TextContent]:
+    """Response for a tool name with no handler."""
+    return [TextContent(type="text", text=f"Unknown tool: {name}")]
+
+# Tool handlers, one per tool, dispatched by name from call_tool
+async def _tool_read_file(arguments: dict):
+    """Handle the read_file tool."""
+    path = Path(arguments["path"])
     
-    if name == "read_file":
-        path = Path(arguments["path"])
-        
-        if not is_path_allowed(path):
-            return [TextContent(
-                type="text",
-                text=f"Error: Path not allowed: {path}"
-            )]
-        
-        if not path.exists():
-            return [TextContent(
-                type="text",
-                text=f"Error: File not found: {path}"
-            )]
-        
-        if not path.is_file():
+    if not is_path_allowed(path):
+        return [TextContent(
+            type="text",
+            text=f"Error: Path not allowed: {path}"
+        )]
+    
+    # Open directly and map failures, rather than stat-ing first
+    try:
+        content = await run_fs(_read_text, path)
+        return [TextContent(
+            type="text",
+            text=content
+        )]
+    except FileNotFoundError:
+        return [TextContent(
+            type="text",
+            text=f"Error: File not found: {path}"
+        )]
+    except IsADirectoryError:
+        return [TextContent(
+            type="text",
+            text=f"Error: Not a file: {path}"
+        )]
+    except PermissionError as e:
+        # Windows reports opening a directory as a permission error
+        if path.is_dir():
             return [TextContent(
                 type="text",
                 text=f"Error: Not a file: {path}"
             )]
-        
-        try:
-            content = path.read_text(encoding='utf-8')
-            return [TextContent(
-                type="text",
-                text=content
-            )]
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error reading file: {e}"
-            )]
+        return [TextContent(
+            type="text",
+            text=f"Error reading file: {e}"
+        )]
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=f"Error reading file: {e}"
+        )]
+
+async def _tool_write_file(arguments: dict):
+    """Handle the write_file tool."""
+    path = Path(arguments["path"])
+    content = arguments["content"]
     
-    elif name == "write_file":
-        path = Path(arguments["path"])
-        content = arguments["content"]
-        
-        if not is_path_allowed(path):
-            return [TextContent(
-                type="text",
-                text=f"Error: Path not allowed: {path}"
-            )]
-        
-        try:
-            # Create parent directories if needed
-            path.parent.mkdir(parents=True, exist_ok=True)
-            
-            path.write_text(content, encoding='utf-8')
-            return [TextContent(
-                type="text",
-                text=f"Successfully wrote {len(content)} bytes to {path}"
-            )]
-        except Exception as e:
+    if not is_path_allowed(path):
+        return [TextContent(
+            type="text",
+            text=f"Error: Path not allowed: {path}"
+        )]
+    
+    try:
+        written = await run_fs(_write_text, path, content)
+        return [TextContent(
+            type="text",
+            text=f"Successfully wrote {written} bytes to {path}"
+        )]
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=f"Error writing file: {e}"
+        )]
+
+async def _tool_append_to_file(arguments: dict):
+    """Handle the append_to_file tool."""
+    path = Path(arguments["path"])
+    content = arguments["content"]
+    
+    if not is_path_allowed(path):
+        return [TextContent(
+            type="text",
+            text=f"Error: Path not allowed: {path}"
+        )]
+    
+    try:
+        written = await run_fs(_append_text, path, content)
+        return [TextContent(
+            type="text",
+            text=f"Successfully appended {written} bytes to {path}"
+        )]
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=f"Error appending to file: {e}"
+        )]
+
+async def _tool_delete_file(arguments: dict):
+    """Handle the delete_file tool."""
+    path = Path(arguments["path"])
+    
+    if not is_path_allowed(path):
+        return [TextContent(
+            type="text",
+            text=f"Error: Path not allowed: {path}"
+        )]
+    
+    try:
+        await run_fs(path.unlink)
+        return [TextContent(
+            type="text",
+            text=f"Successfully deleted {path}"
+        )]
+    except FileNotFoundError:
+        return [TextContent(
+            type="text",
+            text=f"Error: File not found: {path}"
+        )]
+    except (IsADirectoryError, PermissionError) as e:
+        # Windows reports unlinking a directory as a permission error
+        if path.is_dir():
             return [TextContent(
                 type="text",
-                text=f"Error writing file: {e}"
+                text=f"Error: {path} is not a file. Use rmdir for directories."
             )]
+        return [TextContent(
+            type="text",
+            text=f"Error deleting file: {e}"
+        )]
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=f"Error deleting file: {e}"
+        )]
+
+async def _tool_copy_file(arguments: dict):
+    """Handle the copy_file tool."""
+    source = Path(arguments["source"])
+    destination = Path(arguments["destination"])
+    
+    if not is_path_allowed(source) or not is_path_allowed(destination):
+        return _ERR_PATH_NOT_ALLOWED
+    
+    try:
+        await run_fs(_copy_file, source, destination)
+        return [TextContent(
+            type="text",
+            text=f"Successfully copied {source} to {destination}"
+        )]
+    except FileNotFoundError:
+        return [TextContent(
+            type="text",
+            text=f"Error: Source file not found: {source}"
+        )]
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=f"Error copying file: {e}"
+        )]
+
+async def _tool_move_file(arguments: dict):
+    """Handle the move_file tool."""
+    source = Path(arguments["source"])
+    destination = Path(arguments["destination"])
+    
+    if not is_path_allowed(source) or not is_path_allowed(destination):
+        return _ERR_PATH_NOT_ALLOWED
+    
+    try:
+        await run_fs(_move_file, source, destination)
+        return [TextContent(
+            type="text",
+            text=f"Successfully moved {source} to {destination}"
+        )]
+    except FileNotFoundError:
+        return [TextContent(
+            type="text",
+            text=f"Error: Source file not found: {source}"
+        )]
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=f"Error moving file: {e}"
+        )]
+
+async def _tool_file_exists(arguments: dict):
+    """Handle the file_exists tool."""
+    path = Path(arguments["path"])
+    
+    if not is_path_allowed(path):
+        return [TextContent(
+            type="text",
+            text=f"Error: Path not allowed: {path}"
+        )]
+    
+    exists = path.exists()
+    file_type = "directory" if path.is_dir() else "file" if path.is_file() else "unknown"
+    
+    return [TextContent(
+        type="text",
+        text=f"{'Exists' if exists else 'Does not exist'}: {path}" + (f" (type: {file_type})" if exists else "")
+    )]
+
+async def _tool_get_file_info(arguments: dict):
+    """Handle the get_file_info tool."""
+    path = Path(arguments["path"])
+    
+    if not is_path_allowed(path):
+        return [TextContent(
+            type="text",
+            text=f"Error: Path not allowed: {path}"
+        )]
     
-    elif name == "append_to_file":
-        path = Path(arguments["path"])
-        content = arguments["content"]
+    try:
+        # One stat call gives both the metadata and the type
+        st = await run_fs(path.stat)
+        file_type = "directory" if _stat.S_ISDIR(st.st_mode) else "file"
+        size = st.st_size
+        modified = datetime.fromtimestamp(st.st_mtime).isoformat()
+        created = datetime.fromtimestamp(st.st_ctime).isoformat()
         
-        if not is_path_allowed(path):
-            return [TextContent(
-                type="text",
-                text=f"Error: Path not allowed: {path}"
-            )]
+        info = f"""Path: {path}
+Type: {file_type}
+Size: {size} bytes
+Modified: {modified}
+Created: {created}"""
         
-        try:
-            # Create parent directories if needed
-            path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(path, 'a', encoding='utf-8') as f:
-                f.write(content)
-            return [TextContent(
-                type="text",
-                text=f"Successfully appended {len(content)} bytes to {path}"
-            )]
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error appending to file: {e}"
-            )]
+        return [TextContent(
+            type="text",
+            text=info
+        )]
+    except FileNotFoundError:
+        return [TextContent(
+            type="text",
+            text=f"Error: Path not found: {path}"
+        )]
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=f"Error getting file info: {e}"
+        )]
+
+async def _tool_list_directory(arguments: dict):
+    """Handle the list_directory tool."""
+    path = Path(arguments["path"])
     
-    elif name == "delete_file":
-        path = Path(arguments["path"])
-        
-        if not is_path_allowed(path):
-            return [TextContent(
-                type="text",
-                text=f"Error: Path not allowed: {path}"
-            )]
+    if not is_path_allowed(path):
+        return [TextContent(
+            type="text",
+            text=f"Error: Path not allowed: {path}"
+        )]
+    
+    if not path.exists():
+        return [TextContent(
+            type="text",
+            text=f"Error: Directory not found: {path}"
+        )]
+    
+    if not path.is_dir():
+        return [TextContent(
+            type="text",
+            text=f"Error: Not a directory: {path}"
+        )]
+    
+    try:
+        items = await run_fs(_list_directory, path)
         
-        if not path.exists():
+        if not items:
             return [TextContent(
                 type="text",
-                text=f"Error: File not found: {path}"
+                text="(empty directory)"
             )]
         
-        try:
-            if path.is_file():
-                path.unlink()
-                return [TextContent(
-                    type="text",
-                    text=f"Successfully deleted {path}"
-                )]
-            else:
-                return [TextContent(
-                    type="text",
-                    text=f"Error: {path} is not a file. Use rmdir for directories."
-                )]
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error deleting file: {e}"
-            )]
+        return [TextContent(
+            type="text",
+            text="\n".join(items)
+        )]
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=f"Error listing directory: {e}"
+        )]
+
+async def _tool_search_files(arguments: dict):
+    """Handle the search_files tool."""
+    path = Path(arguments["path"])
+    pattern = arguments["pattern"]
+    recursive = arguments.get("recursive", True)
     
-    elif name == "copy_file":
-        source = Path(arguments["source"])
-        destination = Path(arguments["destination"])
+    if not is_path_allowed(path):
+        return [TextContent(
+            type="text",
+            text=f"Error: Path not allowed: {path}"
+        )]
+    
+    if not path.exists():
+        return [TextContent(
+            type="text",
+            text=f"Error: Directory not found: {path}"
+        )]
+    
+    try:
+        matches = await run_fs(_search_files, path, pattern, recursive)
         
-        if not is_path_allowed(source) or not is_path_allowed(destination):
+        if not matches:
             return [TextContent(
                 type="text",
-                text=f"Error: Path not allowed"
+                text=f"No files matching '{pattern}' found in {path}"
             )]
         
-        if not source.exists():
-            return [TextContent(
-                type="text",
-                text=f"Error: Source file not found: {source}"
-            )]
+        header = f"Found {len(matches)} files:\n"
+        if len(matches) >= MAX_SEARCH_RESULTS:
+            header = f"Found {len(matches)} files (stopped at limit of {MAX_SEARCH_RESULTS}):\n"
         
-        try:
-            # Create parent directories if needed
-            destination.parent.mkdir(parents=True, exist_ok=True)
-            
-            shutil.copy2(source, destination)
-            return [TextContent(
-                type="text",
-                text=f"Successfully copied {source} to {destination}"
-            )]
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error copying file: {e}"
-            )]
+        return [TextContent(
+            type="text",
+            text=header + "\n".join(matches)
+        )]
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=f"Error searching files: {e}"
+        )]
+
+async def _tool_run_powershell(arguments: dict):
+    """Handle the run_powershell tool."""
+    command = arguments["command"]
+    working_dir = arguments.get("working_directory")
     
-    elif name == "move_file":
-        source = Path(arguments["source"])
-        destination = Path(arguments["destination"])
+    try:
+        # Use asyncio.create_subprocess_exec for proper async
+        # CRITICAL: stdin=DEVNULL prevents inheriting MCP's stdin pipe
+        process = await asyncio.create_subprocess_exec(
+            "powershell.exe",
+            "-ExecutionPolicy", "Bypass",
+            "-Command", command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=working_dir
+        )
         
-        if not is_path_allowed(source) or not is_path_allowed(destination):
-            return [TextContent(
-                type="text",
-                text=f"Error: Path not allowed"
-            )]
+        try:
+            stdout, stderr, truncated = await asyncio.wait_for(
+                communicate_capped(process),
+                timeout=30
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return _ERR_COMMAND_TIMEOUT
         
-        if not source.exists():
-            return [TextContent(
-                type="text",
-                text=f"Error: Source file not found: {source}"
-            )]
+        # Decode output
+        stdout_text = stdout.decode('utf-8', errors='replace').strip() if stdout else ""
+        stderr_text = stderr.decode('utf-8', errors='replace').strip() if stderr else ""
         
-        try:
-            # Create parent directories if needed
-            destination.parent.mkdir(parents=True, exist_ok=True)
-            
-            shutil.move(str(source), str(destination))
-            return [TextContent(
-                type="text",
-                text=f"Successfully moved {source} to {destination}"
-            )]
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error moving file: {e}"
-            )]
-    
-    elif name == "file_exists":
-        path = Path(arguments["path"])
+        output = ""
+        if stdout_text:
+            output += stdout_text
+        if stderr_text:
+            if output:
+                output += "\n--- STDERR ---\n"
+            output += stderr_text
         
-        if not is_path_allowed(path):
-            return [TextContent(
-                type="text",
-                text=f"Error: Path not allowed: {path}"
-            )]
+        if truncated:
+            output += f"\n\n... (output truncated at {MAX_OUTPUT_BYTES} bytes, process killed)"
         
-        exists = path.exists()
-        file_type = "directory" if path.is_dir() else "file" if path.is_file() else "unknown"
+        if not output:
+            output = "(no output)"
         
         return [TextContent(
             type="text",
-            text=f"{'Exists' if exists else 'Does not exist'}: {path}" + (f" (type: {file_type})" if exists else "")
+            text=f"Exit code: {process.returncode}\n\n{output}"
         )]
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=f"Error running command: {e}"
+        )]
+
+async def _tool_run_git(arguments: dict):
+    """Handle the run_git tool."""
+    args = arguments["args"]
+    working_dir = arguments["working_directory"]
     
-    elif name == "get_file_info":
-        path = Path(arguments["path"])
-        
-        if not is_path_allowed(path):
-            return [TextContent(
-                type="text",
-                text=f"Error: Path not allowed: {path}"
-            )]
+    if GIT_EXE is None:
+        return _ERR_GIT_NOT_FOUND
+    
+    try:
+        # Parse args string into list for subprocess_exec
+        args_list = split_args(args)
         
-        if not path.exists():
-            return [TextContent(
-                type="text",
-                text=f"Error: Path not found: {path}"
-            )]
+        # Use asyncio.create_subprocess_exec - no shell, direct execution
+        # CRITICAL: stdin=DEVNULL prevents inheriting MCP's stdin pipe
+        # This stops Git from waiting for input that will never come
+        process = await asyncio.create_subprocess_exec(
+            GIT_EXE,
+            *args_list,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=working_dir
+        )
         
         try:
-            stat = path.stat()
-            file_type = "directory" if path.is_dir() else "file"
-            size = stat.st_size
-            modified = datetime.fromtimestamp(stat.st_mtime).isoformat()
-            created = datetime.fromtimestamp(stat.st_ctime).isoformat()
-            
-            info = f"""Path: {path}
-Type: {file_type}
-Size: {size} bytes
-Modified: {modified}
-Created: {created}"""
-            
-            return [TextContent(
-                type="text",
-                text=info
-            )]
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error getting file info: {e}"
-            )]
-    
-    elif name == "list_directory":
-        path = Path(arguments["path"])
+            # Wait for completion with timeout
+            stdout, stderr, truncated = await asyncio.wait_for(
+                communicate_capped(process),
+                timeout=10
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return _ERR_GIT_TIMEOUT
         
-        if not is_path_allowed(path):
-            return [TextContent(
-                type="text",
-                text=f"Error: Path not allowed: {path}"
-            )]
+        # Decode output with error handling
+        stdout_text = stdout.decode('utf-8', errors='replace').strip() if stdout else ""
+        stderr_text = stderr.decode('utf-8', errors='replace').strip() if stderr else ""
         
-        if not path.exists():
-            return [TextContent(
-                type="text",
-                text=f"Error: Directory not found: {path}"
-            )]
+        # Combine output
+        output = ""
+        if stdout_text:
+            output = stdout_text
+        if stderr_text:
+            if output:
+                output += "\n--- STDERR ---\n"
+            output += stderr_text
         
-        if not path.is_dir():
-            return [TextContent(
-                type="text",
-                text=f"Error: Not a directory: {path}"
-            )]
+        if truncated:
+            output += f"\n\n... (output truncated at {MAX_OUTPUT_BYTES} bytes, process killed)"
         
-        try:
-            items = []
-            for item in sorted(path.iterdir()):
-                prefix = "[DIR]" if item.is_dir() else "[FILE]"
-                items.append(f"{prefix} {item.name}")
-            
-            if not items:
-                return [TextContent(
-                    type="text",
-                    text="(empty directory)"
-                )]
-            
-            return [TextContent(
-                type="text",
-                text="\n".join(items)
-            )]
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error listing directory: {e}"
-            )]
+        if not output:
+            if process.returncode == 0:
+                output = "(Command executed successfully with no output)"
+            else:
+                output = f"(Command failed with exit code {process.returncode} but no output)"
+        
+        return [TextContent(
+            type="text",
+            text=f"Exit code: {process.returncode}\n\n{output}"
+        )]
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=f"Error running git: {str(e)}"
+        )]
+
+async def _tool_fetch_url(arguments: dict):
+    """Handle the fetch_url tool."""
+    url = arguments["url"]
+    raw = arguments.get("raw", False)
+    max_chars = arguments.get("max_chars", MAX_RESPONSE_CHARS)
     
-    elif name == "search_files":
-        path = Path(arguments["path"])
-        pattern = arguments["pattern"]
-        recursive = arguments.get("recursive", True)
+    try:
+        client = get_http_client()
+        async with client.stream("GET", url, headers={
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }, timeout=15.0) as response:
+            binary = describe_binary(response)
+            if binary is None:
+                # Stop reading once we have more than we'll ever return
+                data, truncated = await read_capped_body(response, MAX_FETCH_BYTES)
         
-        if not is_path_allowed(path):
-            return [TextContent(
-                type="text",
-                text=f"Error: Path not allowed: {path}"
-            )]
+        if binary is not None:
+            content, truncated = binary, False
+        else:
+            content = data.decode(response.encoding or 'utf-8', errors='replace')
+            if not raw:
+                content = strip_html(content)
         
-        if not path.exists():
-            return [TextContent(
-                type="text",
-                text=f"Error: Directory not found: {path}"
-            )]
+        # Truncate if too long
+        if len(content) > max_chars:
+            content = content[:max_chars]
+            truncated = True
+        if truncated:
+            content += "\n\n... (truncated)"
         
+        # Only a redirect changes the URL, so skip re-serializing response.url otherwise
+        final_url = str(response.url) if response.history else url
+        return [TextContent(
+            type="text",
+            text="".join(("Status: ", str(response.status_code), "\nURL: ", final_url, "\n\n", content))
+        )]
+    except httpx.TimeoutException:
+        return _ERR_FETCH_TIMEOUT
+    except Exception as e:
+        return [TextContent(
+            type="text",
+            text=f"Error fetching URL: {e}"
+        )]
+
+async def _tool_fetch_urls(arguments: dict):
+    """Handle the fetch_urls tool."""
+    urls = arguments["urls"]
+    raw = arguments.get("raw", False)
+    max_chars = arguments.get("max_chars", MAX_RESPONSE_CHARS)
+    sem = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    
+    async def fetch(url):
+        async with sem:
+            result = await _tool_fetch_url({"url": url, "raw": raw, "max_chars": max_chars})
+        # Successful results name their URL; label errors so they can be matched up too
+        return [
+            TextContent(type="text", text=f"[{url}] {content.text}") if content.text.startswith("Error") else content
+            for content in result
+        ]
+    
+    # Each fetch_url call handles its own errors, so one bad URL doesn't fail the batch
+    results = await asyncio.gather(*(fetch(url) for url in urls))
+    return [content for result in results for content in result]
+
+async def _tool_http_request(arguments: dict):
+    """Handle the http_request tool."""
+    method = arguments["method"]
+    url = arguments["url"]
+    headers = arguments.get("headers", {})
+    body = arguments.get("body")
+    json_body = arguments.get("json_body")
+    max_chars = arguments.get("max_chars", MAX_RESPONSE_CHARS)
+    
+    # Anything but a read may change the resource, so stop serving cached copies of it,
+    # and don't cache GETs of it until the write has finished
+    if method.upper() not in ("GET", "HEAD"):
+        invalidate_url(url)
+        _pending_writes[url] = _pending_writes.get(url, 0) + 1
         try:
-            matches = []
-            if recursive:
-                for root, dirs, files in os.walk(path):
-                    for filename in fnmatch.filter(files, pattern):
-                        matches.append(os.path.join(root, filename))
-            else:
-                for item in path.iterdir():
-                    if item.is_file() and fnmatch.fnmatch(item.name, pattern):
-                        matches.append(str(item))
-            
-            if not matches:
-                return [TextContent(
-                    type="text",
-                    text=f"No files matching '{pattern}' found in {path}"
-                )]
-            
-            return [TextContent(
-                type="text",
-                text=f"Found {len(matches)} files:\n" + "\n".join(matches)
-            )]
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error searching files: {e}"
-            )]
+            return await _send_http_request(method, url, headers, body, json_body, max_chars, None)
+        finally:
+            _pending_writes[url] -= 1
+            if not _pending_writes[url]:
+                del _pending_writes[url]
     
-    elif name == "run_powershell":
-        command = arguments["command"]
-        working_dir = arguments.get("working_directory")
+    # Plain GETs are served from the response cache when possible
+    cache_key = None
+    if (method.upper() == "GET" and not json_body and not body
+            and url not in _pending_writes and not bypasses_cache(headers)):
+        cache_key = (url, tuple(sorted((str(k), str(v)) for k, v in (headers or {}).items())), max_chars)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        cached = _error_cache.get(cache_key)
+        if cached is not None:
+            print(f"http_request: served from negative cache: {url}", file=sys.stderr)
+            return cached
         
-        try:
-            # Use asyncio.create_subprocess_exec for proper async
-            # CRITICAL: stdin=DEVNULL prevents inheriting MCP's stdin pipe
-            process = await asyncio.create_subprocess_exec(
-                "powershell.exe",
-                "-ExecutionPolicy", "Bypass",
-                "-Command", command,
-                stdin=asyncio.subprocess.DEVNULL,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=working_dir
-            )
-            
-            try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=30
-                )
-            except asyncio.TimeoutError:
-                process.kill()
-                await process.wait()
-                return [TextContent(
-                    type="text",
-                    text="Error: Command timed out after 30 seconds"
-                )]
-            
-            # Decode output
-            stdout_text = stdout.decode('utf-8', errors='replace').strip() if stdout else ""
-            stderr_text = stderr.decode('utf-8', errors='replace').strip() if stderr else ""
-            
-            output = ""
-            if stdout_text:
-                output += stdout_text
-            if stderr_text:
-                if output:
-                    output += "\n--- STDERR ---\n"
-                output += stderr_text
-            
-            if not output:
-                output = "(no output)"
-            
-            return [TextContent(
-                type="text",
-                text=f"Exit code: {process.returncode}\n\n{output}"
-            )]
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error running command: {e}"
-            )]
+        # Identical GETs already in flight share one request instead of each sending their own.
+        # Callers await a shielded task so one caller cancelling doesn't cancel it for the others.
+        task = _inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(_send_http_request(method, url, headers, body, json_body, max_chars, cache_key))
+            _inflight[cache_key] = task
+            task.add_done_callback(lambda t: _forget_inflight(cache_key, t))
+        return await asyncio.shield(task)
     
-    elif name == "run_git":
-        args = arguments["args"]
-        working_dir = arguments["working_directory"]
+    return await _send_http_request(method, url, headers, body, json_body, max_chars, cache_key)
+
+async def _send_http_request(method: str, url: str, headers: dict, body, json_body, max_chars: int, cache_key):
+    """Send an http_request call and format the response, storing it in the caches if cache_key is set."""
+    try:
+        client = get_http_client()
         
-        # Find Git executable
-        git_exe = r"C:\Program Files\Git\cmd\git.exe"
-        if not Path(git_exe).exists():
-            git_exe = r"C:\Program Files\Git\bin\git.exe"
-        if not Path(git_exe).exists():
-            return [TextContent(
-                type="text",
-                text="Error: Git not found. Check installation."
-            )]
+        # Prepare request kwargs
+        kwargs = {"headers": headers, "timeout": 30.0}
         
-        try:
-            # Parse args string into list for subprocess_exec
-            args_list = args.split()
-            
-            # Use asyncio.create_subprocess_exec - no shell, direct execution
-            # CRITICAL: stdin=DEVNULL prevents inheriting MCP's stdin pipe
-            # This stops Git from waiting for input that will never come
-            process = await asyncio.create_subprocess_exec(
-                git_exe,
-                *args_list,
-                stdin=asyncio.subprocess.DEVNULL,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=working_dir
-            )
-            
+        if json_body:
+            kwargs["json"] = json_body
+        elif body:
+            kwargs["content"] = body
+        
+        # Make request, reading no more of the body than we'll keep
+        async with client.stream(method, url, **kwargs) as response:
+            binary = describe_binary(response)
+            if binary is None:
+                data, truncated = await read_capped_body(response, MAX_BODY_BYTES)
+        
+        if binary is not None:
+            response_body, truncated = binary, False
+        else:
+            # Try to parse as JSON for nice formatting (a cut-off body won't parse)
             try:
-                # Wait for completion with timeout
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=10
-                )
-            except asyncio.TimeoutError:
-                process.kill()
-                await process.wait()
-                return [TextContent(
-                    type="text",
-                    text="Error: Git command timed out after 10 seconds"
-                )]
-            
-            # Decode output with error handling
-            stdout_text = stdout.decode('utf-8', errors='replace').strip() if stdout else ""
-            stderr_text = stderr.decode('utf-8', errors='replace').strip() if stderr else ""
-            
-            # Combine output
-            output = ""
-            if stdout_text:
-                output = stdout_text
-            if stderr_text:
-                if output:
-                    output += "\n--- STDERR ---\n"
-                output += stderr_text
-            
-            if not output:
-                if process.returncode == 0:
-                    output = "(Command executed successfully with no output)"
-                else:
-                    output = f"(Command failed with exit code {process.returncode} but no output)"
-            
-            return [TextContent(
-                type="text",
-                text=f"Exit code: {process.returncode}\n\n{output}"
-            )]
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error running git: {str(e)}"
-            )]
-    
-    elif name == "fetch_url":
-        url = arguments["url"]
-        raw = arguments.get("raw", False)
+                response_body = pretty_json(data)
+            except (ValueError, TypeError):
+                response_body = data.decode(response.encoding or 'utf-8', errors='replace')
         
-        try:
-            async with httpx.AsyncClient(follow_redirects=True, timeout=15.0) as client:
-                response = await client.get(url, headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                })
-                
-                content = response.text
-                
-                if not raw:
-                    content = strip_html(content)
-                
-                # Truncate if too long
-                if len(content) > 50000:
-                    content = content[:50000] + "\n\n... (truncated)"
-                
-                return [TextContent(
-                    type="text",
-                    text=f"Status: {response.status_code}\nURL: {response.url}\n\n{content}"
-                )]
-        except httpx.TimeoutException:
-            return [TextContent(
-                type="text",
-                text=f"Error: Request timed out after 15 seconds"
-            )]
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error fetching URL: {e}"
-            )]
-    
-    elif name == "http_request":
-        method = arguments["method"]
-        url = arguments["url"]
-        headers = arguments.get("headers", {})
-        body = arguments.get("body")
-        json_body = arguments.get("json_body")
+        # Truncate if too long
+        if len(response_body) > max_chars:
+            response_body = response_body[:max_chars]
+            truncated = True
+        if truncated:
+            response_body += "\n\n... (truncated)"
         
-        try:
-            async with httpx.AsyncClient(follow_redirects=True, timeout=30.0) as client:
-                # Prepare request kwargs
-                kwargs = {"headers": headers}
-                
-                if json_body:
-                    kwargs["json"] = json_body
-                elif body:
-                    kwargs["content"] = body
-                
-                # Make request
-                response = await client.request(method, url, **kwargs)
-                
-                # Try to parse as JSON for nice formatting
-                try:
-                    response_body = json.dumps(response.json(), indent=2)
-                except:
-                    response_body = response.text
-                
-                # Truncate if too long
-                if len(response_body) > 50000:
-                    response_body = response_body[:50000] + "\n\n... (truncated)"
-                
-                return [TextContent(
-                    type="text",
-                    text=f"Status: {response.status_code}\nURL: {response.url}\n\n{response_body}"
-                )]
-        except httpx.TimeoutException:
-            return [TextContent(
-                type="text",
-                text=f"Error: Request timed out after 30 seconds"
-            )]
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error making request: {e}"
-            )]
-    
-    elif name == "get_time":
-        now = datetime.now()
-        return [TextContent(
+        # One join sized up front, rather than formatting around a large body
+        final_url = str(response.url) if response.history else url
+        result = [TextContent(
             type="text",
-            text=f"{now.strftime('%A, %d %B %Y, %I:%M %p')} ({now.strftime('%Y-%m-%d %H:%M:%S')})"
-        )]
-    
-    else:
-        return [TextContent(
-            type="text",
-            text=f"Unknown tool: {name}"
+            text="".join(("Status: ", str(response.status_code), "\nURL: ", final_url, "\n\n", response_body))
         )]
+        
+        if _owns_inflight(cache_key):
+            if response.status_code >= 500:
+                _error_cache.set(cache_key, result, SERVER_ERROR_TTL)
+            elif response.status_code >= 400:
+                _error_cache.set(cache_key, result, CLIENT_ERROR_TTL)
+            else:
+                ttl = response_cache_ttl(response.headers)
+                if ttl is not None:
+                    _response_cache.set(cache_key, result, ttl)
+        
+        return result
+    except httpx.TimeoutException:
+        return _ERR_REQUEST_TIMEOUT
+    except httpx.ConnectError as e:
+        # DNS failures and refused connections rarely clear up within seconds
+        return _request_error(e, cache_key, CONNECT_ERROR_TTL)
+    except (httpx.ReadError, httpx.RemoteProtocolError) as e:
+        # Dropped connections are often transient
+        return _request_error(e, cache_key, READ_ERROR_TTL)
+    except Exception as e:
+        return _request_error(e, None, 0)
+
+def _request_error(e: Exception, cache_key, ttl: float) -> list[TextContent]:
+    """Format an http_request failure, remembering it in the error cache if cache_key is set."""
+    result = [TextContent(
+        type="text",
+        text=f"Error making request: {e}"
+    )]
+    if _owns_inflight(cache_key):
+        _error_cache.set(cache_key, result, ttl)
+    return result
+
+async def _tool_get_time(arguments: dict):
+    """Handle the get_time tool."""
+    tm = time.localtime()
+    # Numeric timestamp built directly from the fields; strftime only for the locale names
+    iso = f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d} {tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}"
+    pretty = time.strftime(GET_TIME_FORMAT, tm)
+    return [TextContent(
+        type="text",
+        text=f"{pretty} ({iso})"
+    )]
+
+_HANDLERS: dict[str, Callable[[dict], Awaitable[list[TextContent]]]] = {
+    "read_file": _tool_read_file,
+    "write_file": _tool_write_file,
+    "append_to_file": _tool_append_to_file,
+    "delete_file": _tool_delete_file,
+    "copy_file": _tool_copy_file,
+    "move_file": _tool_move_file,
+    "file_exists": _tool_file_exists,
+    "get_file_info": _tool_get_file_info,
+    "list_directory": _tool_list_directory,
+    "search_files": _tool_search_files,
+    "run_powershell": _tool_run_powershell,
+    "run_git": _tool_run_git,
+    "fetch_url": _tool_fetch_url,
+    "fetch_urls": _tool_fetch_urls,
+    "http_request": _tool_http_request,
+    "get_time": _tool_get_time,
+}
+
+@server.call_tool()
+async def call_tool(name: str, arguments: dict):
+    """Handle tool calls."""
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return _unknown_tool(name)
+    return await handler(arguments)
+
+# Built after every handler is registered, since capabilities are derived from them
+_INIT_OPTS = server.create_initialization_options()
 
 async def main():
     """Run the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options()
-        )
+    # Build the shared HTTP client (and its SSL context) up front, not on the first web tool call
+    get_http_client()
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                _INIT_OPTS
+            )
+    finally:
+        await close_http_client()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())